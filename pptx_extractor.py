@@ -1,65 +1,167 @@
 #!/usr/bin/env python3
 
 from pptx import Presentation
+from pptx.shapes.base import BaseShape
+import pptx.oxml
+from lxml import etree
+import io
 import json
+import os
 import platform
 import shutil
+import stat
+import sys
+import tempfile
 import argparse
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import lru_cache, partial
+from itertools import islice
 from pathlib import Path
 
+try:
+    import orjson  # optional, faster JSON for the config file
+except ImportError:
+    orjson = None
+
 SCRIPT_DIR = Path(__file__).resolve().parent
 CONFIG_FILE = SCRIPT_DIR / '.slides-config.json'
 
-
-def extract_table_as_markdown(table):
-    """Convert a PowerPoint table to a markdown table."""
-    rows = []
-    for row in table.rows:
-        cells = [cell.text.strip().replace('|', '\\|') for cell in row.cells]
+# python-pptx parses every package part with this module-level parser. We only
+# read, so swap in one that skips building the xml:id lookup table for each
+# part. Entity resolution stays off, lxml's default size limits stay on, and
+# the custom element class lookup python-pptx relies on is kept.
+_oxml_parser = etree.XMLParser(remove_blank_text=True, resolve_entities=False,
+                               collect_ids=False)
+_oxml_parser.set_element_class_lookup(pptx.oxml.element_class_lookup)
+pptx.oxml.oxml_parser = _oxml_parser
+
+# Compiled XPath queries and tag names for reading text straight from the
+# shape XML, bypassing python-pptx's proxy objects on the hot path.
+_NAMESPACES = {
+    'a': 'http://schemas.openxmlformats.org/drawingml/2006/main',
+    'p': 'http://schemas.openxmlformats.org/presentationml/2006/main',
+}
+_PARA_XPATH = etree.XPath('.//a:p', namespaces=_NAMESPACES)
+_ROW_XPATH = etree.XPath('a:graphic/a:graphicData/a:tbl/a:tr', namespaces=_NAMESPACES)
+_CELL_XPATH = etree.XPath('a:tc', namespaces=_NAMESPACES)
+_P_TAG = '{%s}p' % _NAMESPACES['a']
+_PPR_TAG = '{%s}pPr' % _NAMESPACES['a']
+_R_TAG = '{%s}r' % _NAMESPACES['a']
+_FLD_TAG = '{%s}fld' % _NAMESPACES['a']
+_T_TAG = '{%s}t' % _NAMESPACES['a']
+_BR_TAG = '{%s}br' % _NAMESPACES['a']
+_TX_BODY_TAG = '{%s}txBody' % _NAMESPACES['p']
+_SP_TAG = '{%s}sp' % _NAMESPACES['p']
+_GRAPHIC_FRAME_TAG = '{%s}graphicFrame' % _NAMESPACES['p']
+_GRP_SP_TAG = '{%s}grpSp' % _NAMESPACES['p']
+
+# Bullet prefix per paragraph level. PowerPoint levels run 0-8; level 0 is
+# plain text and deeper levels indent two spaces per step below level 1.
+_MAX_LEVEL = 8
+_BULLET_PREFIXES = [''] + ['  ' * (level - 1) + '- ' for level in range(1, _MAX_LEVEL + 1)]
+
+# Table cells: escape pipes, and flatten paragraph and line breaks so a
+# multi-line cell doesn't split its markdown row
+_CELL_TRANSLATION = str.maketrans({'|': '\\|', '\n': ' ', '\v': ' '})
+
+
+def _paragraph_text(p: etree._Element) -> str:
+    """Return the text of an a:p element, with line breaks as vertical tabs."""
+    return ''.join('\v' if child.tag == _BR_TAG else child.findtext(_T_TAG, '')
+                   for child in p.iterchildren(_R_TAG, _FLD_TAG, _BR_TAG))
+
+
+@lru_cache(maxsize=16)
+def _table_separator(col_count: int) -> str:
+    """Return the markdown header separator row for a table of col_count columns."""
+    return '| ' + ' | '.join(['---'] * col_count) + ' |'
+
+
+def _table_row(cells: list[str], col_count: int) -> str:
+    """Return one markdown table row, padding short rows in place to col_count."""
+    if len(cells) < col_count:
+        cells.extend([''] * (col_count - len(cells)))
+    return '| ' + ' | '.join(cells) + ' |'
+
+
+def extract_table_as_markdown(graphic_frame: etree._Element) -> list[str]:
+    """Convert a table's p:graphicFrame element to a list of markdown table lines."""
+    rows: list[list[str]] = []
+    col_count = 0
+    for tr in _ROW_XPATH(graphic_frame):
+        cells = []
+        for tc in _CELL_XPATH(tr):
+            cell_text = '\n'.join(_paragraph_text(p) for p in _PARA_XPATH(tc))
+            cells.append(cell_text.strip().translate(_CELL_TRANSLATION))
         rows.append(cells)
+        col_count = max(col_count, len(cells))
 
     if not rows:
-        return ""
-
-    col_count = max(len(row) for row in rows)
-    # Pad rows to same length
-    rows = [row + [''] * (col_count - len(row)) for row in rows]
-
-    header = '| ' + ' | '.join(rows[0]) + ' |'
-    separator = '| ' + ' | '.join(['---'] * col_count) + ' |'
-    body_rows = ['| ' + ' | '.join(row) + ' |' for row in rows[1:]]
-
-    return '\n'.join([header, separator] + body_rows)
-
-
-def extract_text_from_shape(shape):
-    """Extract text from a shape with markdown formatting."""
-    text_items = []
-
-    # Tables — render as markdown tables (skip shape.text to avoid duplicates)
-    if shape.has_table:
-        table_md = extract_table_as_markdown(shape.table)
-        if table_md:
-            text_items.append(table_md)
-        return text_items
-
-    # Text frames — handle paragraph levels for bullet formatting
-    if shape.has_text_frame:
-        for paragraph in shape.text_frame.paragraphs:
-            text = paragraph.text.strip()
-            if text:
-                level = paragraph.level
-                if level > 0:
-                    indent = '  ' * (level - 1)
-                    text_items.append(f"{indent}- {text}")
-                else:
-                    text_items.append(text)
-        return text_items
-
-    # Grouped shapes
-    if shape.shape_type == 6:  # GROUP shape type
-        for sub_shape in shape.shapes:
-            text_items.extend(extract_text_from_shape(sub_shape))
+        return []
+
+    lines = [_table_row(rows[0], col_count), _table_separator(col_count)]
+    lines.extend(_table_row(row, col_count) for row in islice(rows, 1, None))
+
+    return lines
+
+
+def _handle_sp(element: etree._Element, text_items: list[str],
+               stack: list[etree._Element]) -> None:
+    """Text frames — only p:sp carries one; handle paragraph levels for bullets."""
+    tx_body = element.find(_TX_BODY_TAG)
+    if tx_body is None:
+        return
+
+    # Iterate the a:p children lazily rather than materializing a list
+    for p in tx_body.iterchildren(_P_TAG):
+        text = _paragraph_text(p).strip()
+        if text:
+            pPr = p.find(_PPR_TAG)
+            level = int(pPr.get('lvl', 0)) if pPr is not None else 0
+            text_items.append('')
+            if level > 0:
+                text_items.append(_BULLET_PREFIXES[min(level, _MAX_LEVEL)] + text)
+            else:
+                text_items.append(text)
+
+
+def _handle_graphic_frame(element: etree._Element, text_items: list[str],
+                          stack: list[etree._Element]) -> None:
+    """Tables — render as markdown; charts and other objects have no rows and yield nothing."""
+    table_lines = extract_table_as_markdown(element)
+    if table_lines:
+        text_items.append('')
+        text_items.extend(table_lines)
+
+
+def _handle_grp_sp(element: etree._Element, text_items: list[str],
+                   stack: list[etree._Element]) -> None:
+    """Grouped shapes — push children reversed so they pop in slide order."""
+    stack.extend(reversed(element))
+
+
+# Shape handlers keyed on element tag. Anything else (pictures, connectors,
+# and non-shape children of a group such as p:grpSpPr) has no text.
+_SHAPE_HANDLERS = {
+    _SP_TAG: _handle_sp,
+    _GRAPHIC_FRAME_TAG: _handle_graphic_frame,
+    _GRP_SP_TAG: _handle_grp_sp,
+}
+
+
+def extract_text_from_shape(shape: BaseShape) -> list[str]:
+    """Extract markdown lines from a shape, with a blank line before each block."""
+    text_items: list[str] = []
+
+    # Walk grouped shapes with an explicit stack rather than recursion,
+    # dispatching on the element tag instead of probing proxy properties
+    stack: list[etree._Element] = [shape._element]
+    while stack:
+        element = stack.pop()
+        handler = _SHAPE_HANDLERS.get(element.tag)
+        if handler is not None:
+            handler(element, text_items, stack)
 
     return text_items
 
@@ -76,36 +178,69 @@ def extract_notes(slide):
     return None
 
 
-def extract_text_from_pptx(file_path):
-    """Extract all text from a PPTX file and return as markdown."""
-    prs = Presentation(file_path)
-    text_runs = []
+def iter_markdown_lines(file_path, base_name=None):
+    """Return an iterator over the markdown for a PPTX file, one line at a time.
+
+    The deck is opened before this returns, so an unreadable file raises here
+    rather than partway through writing the output. base_name is the document
+    heading; it defaults to the file's stem.
+    """
+    # Read the whole package in one go so zipfile parses from memory instead
+    # of issuing many small seeks and reads against the file on disk
+    with open(file_path, 'rb') as f:
+        data = f.read()
+    prs = Presentation(io.BytesIO(data))
 
+    if base_name is None:
+        base_name = Path(file_path).stem
+    return _iter_presentation_lines(prs, base_name)
+
+
+def _iter_presentation_lines(prs, base_name):
+    """Yield the markdown for an opened presentation, one slide at a time."""
     # Add document title as h1
-    base_name = Path(file_path).stem
-    text_runs.append(f"# {base_name}\n")
+    yield f"# {base_name}"
+    yield ''
 
     for slide_number, slide in enumerate(prs.slides, start=1):
+        lines = []
+
+        # Walk the shape tree once; the title placeholder (idx 0) is picked
+        # out of the same list instead of a second scan via shapes.title
+        shapes = list(slide.shapes)
+        title_shape = next((shape for shape in shapes
+                            if shape.is_placeholder and shape.placeholder_format.idx == 0),
+                           None)
+
         # Use slide title as heading if available
-        title_shape = slide.shapes.title
-        if title_shape and title_shape.text.strip():
-            text_runs.append(f"## {title_shape.text.strip()}\n")
+        lines.append('')
+        if title_shape and (title_text := title_shape.text.strip()):
+            lines.append(f"## {title_text}")
         else:
-            text_runs.append(f"## Slide {slide_number}\n")
+            lines.append(f"## Slide {slide_number}")
+        lines.append('')
 
-        for shape in slide.shapes:
+        # Compare plain ints in the loop rather than re-reading the title's id
+        title_id = title_shape.shape_id if title_shape is not None else -1
+
+        for shape in shapes:
             # Skip the title shape — already used as the heading
-            if title_shape is not None and shape.shape_id == title_shape.shape_id:
+            if shape.shape_id == title_id:
                 continue
-            text_runs.extend(extract_text_from_shape(shape))
+            lines.extend(extract_text_from_shape(shape))
 
         # Append speaker notes as blockquote
         notes = extract_notes(slide)
         if notes:
-            quoted = '\n'.join(f'> {line}' for line in notes.split('\n'))
-            text_runs.append(f"\n**Notes:**\n{quoted}")
+            lines.extend(('', '', "**Notes:**"))
+            lines.extend(f'> {line}' for line in notes.split('\n'))
+
+        yield from lines
 
-    return "\n\n".join(text_runs)
+
+def extract_text_from_pptx(file_path, base_name=None):
+    """Extract all text from a PPTX file and return as markdown."""
+    return '\n'.join(iter_markdown_lines(file_path, base_name))
 
 
 def create_folder_structure(base_dir, quiet=False):
@@ -129,12 +264,18 @@ def create_folder_structure(base_dir, quiet=False):
 
 # --- Config & interactive setup ---
 
+@lru_cache(maxsize=1)
 def load_config():
-    """Load saved config, or return None if no config exists."""
+    """Load saved config, or return None if no config exists.
+
+    The result is cached for the life of the process; save_config clears it.
+    """
     if CONFIG_FILE.exists():
         try:
-            with open(CONFIG_FILE, 'r') as f:
-                return json.load(f)
+            data = CONFIG_FILE.read_bytes()
+            if orjson is not None:
+                return orjson.loads(data)
+            return json.loads(data)
         except (json.JSONDecodeError, OSError):
             pass
     return None
@@ -143,8 +284,11 @@ def load_config():
 def save_config(working_dir):
     """Save the chosen working directory to config."""
     config = {'working_dir': str(working_dir)}
-    with open(CONFIG_FILE, 'w') as f:
-        json.dump(config, f, indent=2)
+    if orjson is not None:
+        CONFIG_FILE.write_bytes(orjson.dumps(config, option=orjson.OPT_INDENT_2))
+    else:
+        CONFIG_FILE.write_text(json.dumps(config, indent=2))
+    load_config.cache_clear()
     print(f"\nSaved to {CONFIG_FILE}")
     print(f"Future runs will use: {working_dir}")
     print(f"(Override anytime with --dir or re-run --setup)\n")
@@ -245,6 +389,109 @@ def resolve_working_dir(cli_dir=None):
     return SCRIPT_DIR
 
 
+def _write_lines(output_file, lines, batch_size=1024 * 1024):
+    """Write lines to output_file, newline-terminated, through a raw file descriptor.
+
+    Lines are UTF-8 encoded and written in batches of roughly batch_size bytes
+    with os.write, skipping the text I/O wrapper and its buffered writer. They
+    go to a temporary file next to output_file, which replaces it only once
+    everything is written, so a failure never leaves a truncated or partial file.
+    """
+    output_file = Path(output_file)
+    fd, temp_name = tempfile.mkstemp(dir=output_file.parent,
+                                     prefix=f".{output_file.name}.", suffix='.tmp')
+    temp_file = Path(temp_name)
+    try:
+        try:
+            batch = []
+            size = 0
+            for line in lines:
+                data = (line + '\n').encode('utf-8')
+                batch.append(data)
+                size += len(data)
+                if size >= batch_size:
+                    _write_all(fd, b''.join(batch))
+                    batch.clear()
+                    size = 0
+            if batch:
+                _write_all(fd, b''.join(batch))
+        finally:
+            os.close(fd)
+        os.chmod(temp_file, _output_file_mode(output_file))
+        os.replace(temp_file, output_file)
+    except BaseException:
+        temp_file.unlink(missing_ok=True)
+        raise
+
+
+def _output_file_mode(output_file):
+    """Return the permission bits a rewritten output_file should have.
+
+    An existing file keeps its mode; a new one gets what open() would give it.
+    mkstemp creates files as 0o600, so this is applied before os.replace.
+    """
+    try:
+        return stat.S_IMODE(os.stat(output_file).st_mode)
+    except FileNotFoundError:
+        umask = os.umask(0)
+        os.umask(umask)
+        return 0o666 & ~umask
+
+
+def _write_all(fd, data):
+    """Write all of data to fd, retrying after short writes."""
+    view = memoryview(data)
+    while view:
+        written = os.write(fd, view)
+        view = view[written:]
+
+
+def _extract_and_write(pptx_file, output_dir):
+    """Extract one PPTX file to markdown in output_dir and return the output path.
+
+    Kept at module level so it can be pickled for worker processes. Errors are
+    re-raised as RuntimeError carrying the original message, because some
+    exceptions (lxml's XMLSyntaxError) can't be pickled back to the parent.
+    """
+    # Create output markdown file
+    base_name = pptx_file.stem
+    output_file = output_dir / f"{base_name}.md"
+
+    # Stream lines straight to disk rather than building the whole document
+    try:
+        _write_lines(output_file, iter_markdown_lines(pptx_file, base_name))
+    except Exception as e:
+        raise RuntimeError(str(e)) from None
+
+    return output_file
+
+
+# ProcessPoolExecutor rejects more than 61 workers on Windows
+_MAX_WORKERS = 61 if sys.platform == 'win32' else None
+
+
+def _finish_file(pptx_file, get_output_file, processed_dir, keep):
+    """Report the result of extracting one file and move or keep the original.
+
+    get_output_file returns the written markdown path, or raises if extraction failed.
+    """
+    try:
+        output_file = get_output_file()
+        print(f"\nProcessed: {pptx_file.name}")
+        print(f"  -> {output_file}")
+
+        # Move or keep original
+        if keep:
+            print(f"  (original kept in input)")
+        else:
+            processed_file = processed_dir / pptx_file.name
+            shutil.move(str(pptx_file), str(processed_file))
+            print(f"  -> moved to processed/")
+
+    except Exception as e:
+        print(f"\n  ERROR: {pptx_file.name}: {str(e)}")
+
+
 def process_pptx_files(base_dir, keep=False):
     """Process all PPTX files in the input directory."""
     folders = create_folder_structure(base_dir, quiet=True)
@@ -253,11 +500,13 @@ def process_pptx_files(base_dir, keep=False):
     processed_dir = folders['processed']
     output_dir = folders['output']
 
-    # Find all PPTX files in input directory (case-insensitive)
-    pptx_files = list(input_dir.glob('*.[Pp][Pp][Tt][Xx]'))
-
-    # Filter out temporary Office files (start with ~$)
-    pptx_files = [f for f in pptx_files if not f.name.startswith('~$')]
+    # Find all PPTX files in input directory (case-insensitive) in a single
+    # directory scan, skipping temporary Office files (start with ~$)
+    with os.scandir(input_dir) as entries:
+        pptx_files = [Path(entry.path) for entry in entries
+                      if entry.is_file()
+                      and not entry.name.startswith('~$')
+                      and entry.name.lower().endswith('.pptx')]
 
     if not pptx_files:
         print(f"No PPTX files found in {input_dir}")
@@ -265,32 +514,33 @@ def process_pptx_files(base_dir, keep=False):
 
     print(f"Found {len(pptx_files)} PPTX file(s) to process")
 
-    for pptx_file in pptx_files:
-        try:
-            print(f"\nProcessing: {pptx_file.name}")
-
-            # Extract text
-            extracted_text = extract_text_from_pptx(pptx_file)
-
-            # Create output markdown file
-            base_name = pptx_file.stem
-            output_file = output_dir / f"{base_name}.md"
-
-            with open(output_file, "w", encoding="utf-8") as f:
-                f.write(extracted_text)
-
-            print(f"  -> {output_file}")
-
-            # Move or keep original
-            if keep:
-                print(f"  (original kept in input)")
-            else:
-                processed_file = processed_dir / pptx_file.name
-                shutil.move(str(pptx_file), str(processed_file))
-                print(f"  -> moved to processed/")
-
-        except Exception as e:
-            print(f"  ERROR: {pptx_file.name}: {str(e)}")
+    # Decks whose names differ only in extension case (a.pptx, a.PPTX) write
+    # the same output .md, so those are extracted one at a time in this
+    # process instead of racing each other in the pool
+    stem_counts = Counter(f.stem.lower() for f in pptx_files)
+    parallel_files = [f for f in pptx_files if stem_counts[f.stem.lower()] == 1]
+    serial_files = sorted(f for f in pptx_files if stem_counts[f.stem.lower()] > 1)
+
+    # A single deck isn't worth the cost of starting a worker process
+    if len(parallel_files) == 1:
+        serial_files.insert(0, parallel_files.pop())
+
+    if parallel_files:
+        # Each file is independent, so extract them in parallel worker processes.
+        # Moving originals stays in this process so workers never touch input/.
+        max_workers = min(len(parallel_files), os.cpu_count() or 1)
+        if _MAX_WORKERS is not None:
+            max_workers = min(max_workers, _MAX_WORKERS)
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = {executor.submit(_extract_and_write, pptx_file, output_dir): pptx_file
+                       for pptx_file in parallel_files}
+
+            for future in as_completed(futures):
+                _finish_file(futures[future], future.result, processed_dir, keep)
+
+    for pptx_file in serial_files:
+        _finish_file(pptx_file, partial(_extract_and_write, pptx_file, output_dir),
+                     processed_dir, keep)
 
     print("\nDone.")
 